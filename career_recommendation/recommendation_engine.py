@@ -1,14 +1,41 @@
-import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Any
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
+from typing import List, Dict, Any, Optional
 import json
+import sys
+
+# Number of set bits in every byte value, for popcounts over packed bitsets
+_POPCOUNT_8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _sorted_intersection_size(a: tuple, b: tuple) -> int:
+    """Size of the intersection of two sorted, duplicate-free tuples
+    
+    A two-pointer merge; for a handful of interned strings this avoids
+    hashing every element the way a set intersection would.
+    """
+    i = j = count = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            count += 1
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return count
 
 class CareerRecommendationEngine:
     def __init__(self):
         self.job_database = self._load_job_database()
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+        self._title_to_index = {job['job_title']: i for i, job in enumerate(self.job_database)}
+        # Stateless hashing avoids the vocabulary lookup per token in transform();
+        # the idf weighting and L2 norm match the previous TfidfVectorizer
+        self.vectorizer = Pipeline([
+            ('hash', HashingVectorizer(n_features=2**15, stop_words='english', alternate_sign=False, norm=None)),
+            ('tfidf', TfidfTransformer(norm='l2')),
+        ])
         self._prepare_job_vectors()
     
     def _load_job_database(self) -> List[Dict]:
@@ -89,92 +116,280 @@ class CareerRecommendationEngine:
         ]
     
     def _prepare_job_vectors(self):
-        """Prepare TF-IDF vectors for job matching"""
+        """Prepare TF-IDF vectors and lowercased lookup sets for job matching"""
         job_texts = []
         for job in self.job_database:
             text = f"{job['description']} {' '.join(job['required_skills'])} {' '.join(job['preferred_skills'])}"
             job_texts.append(text)
+            
+            # Lowercase once here so scoring only does set intersections
+            job['_req_lc'] = frozenset(skill.lower() for skill in job['required_skills'])
+            job['_pref_lc'] = frozenset(skill.lower() for skill in job['preferred_skills'])
+            job['_ind_lc'] = frozenset(ind.lower() for ind in job['industries'])
+            job['_ind_sorted'] = tuple(sorted(sys.intern(ind) for ind in job['_ind_lc']))
+            job['_edu_lc'] = frozenset(edu.lower() for edu in job['education_requirements'])
+            job['_exp_lc'] = frozenset(exp.lower() for exp in job['experience_levels'])
+            job['_req_len'] = len(job['_req_lc'])
+            job['_pref_len'] = len(job['_pref_lc'])
         
         self.job_vectors = self.vectorizer.fit_transform(job_texts)
+        
+        # Hashed features no job uses would otherwise get the maximum idf and
+        # dilute the user's vector; zero them so, like a fitted vocabulary,
+        # unseen terms are ignored
+        tfidf = self.vectorizer.named_steps['tfidf']
+        seen = np.zeros(len(tfidf.idf_), dtype=bool)
+        seen[self.job_vectors.indices] = True
+        tfidf.idf_ = np.where(seen, tfidf.idf_, 0.0)
+        
+        # Column-wise (structure-of-arrays) view of the job table so that
+        # get_recommendations can score every job with a few NumPy ops
+        self._skill_vocab = self._build_vocab(job[key] for job in self.job_database for key in ('_req_lc', '_pref_lc'))
+        self._bit_to_skill = list(self._skill_vocab)
+        self._industry_vocab = self._build_vocab(job['_ind_lc'] for job in self.job_database)
+        self._exp_vocab = self._build_vocab(job['_exp_lc'] for job in self.job_database)
+        self._edu_vocab = self._build_vocab(job['_edu_lc'] for job in self.job_database)
+        
+        self._industry_matrix = self._membership_matrix('_ind_lc', self._industry_vocab)
+        self._exp_matrix = self._membership_matrix('_exp_lc', self._exp_vocab)
+        self._edu_matrix = self._membership_matrix('_edu_lc', self._edu_vocab)
+        
+        self._req_sizes = np.array([job['_req_len'] for job in self.job_database], dtype=np.float64)
+        self._pref_sizes = np.array([job['_pref_len'] for job in self.job_database], dtype=np.float64)
+        
+        # Skills as bitsets over the vocabulary (bit i == skill i): Python ints
+        # for the single-job paths, and the same bits packed into uint64 rows
+        # of width ceil(vocab / 64) for scoring all jobs at once
+        self._skill_words = max(1, -(-len(self._skill_vocab) // 64))
+        for job in self.job_database:
+            job['_req_mask'] = self._skill_mask(job['_req_lc'])
+            job['_pref_mask'] = self._skill_mask(job['_pref_lc'])
+        
+        self._req_bits = np.stack([self._pack_mask(job['_req_mask']) for job in self.job_database])
+        self._pref_bits = np.stack([self._pack_mask(job['_pref_mask']) for job in self.job_database])
+        
+        # Static part of each recommendation; the score slot is filled per request
+        self._job_output_cache = [
+            {
+                "job_title": job["job_title"],
+                "match_percentage": None,
+                "description": job["description"],
+                "required_skills": job["required_skills"],
+                "salary_range": job["salary_range"],
+                "growth_prospects": job["growth_prospects"],
+                "remote_friendly": job["remote_friendly"],
+                "industries": job["industries"]
+            }
+            for job in self.job_database
+        ]
+    
+    def _pack_mask(self, mask: int) -> np.ndarray:
+        """Split an int bitset into little-endian uint64 words"""
+        return np.array([(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for word in range(self._skill_words)],
+                        dtype=np.uint64)
+    
+    @staticmethod
+    def _popcount_rows(bits: np.ndarray) -> np.ndarray:
+        """Count set bits along the last axis of a packed uint64 array"""
+        return _POPCOUNT_8[bits.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+    
+    def _skill_mask(self, skills) -> int:
+        """Encode lowercased skills as a bitset over the skill vocabulary, skipping unknown skills"""
+        mask = 0
+        for skill in skills:
+            bit = self._skill_vocab.get(skill)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+    
+    def _mask_to_skills(self, mask: int) -> List[str]:
+        """Decode a skill bitset back to lowercased skill names, lowest bit first"""
+        skills = []
+        while mask:
+            lowest = mask & -mask
+            skills.append(self._bit_to_skill[lowest.bit_length() - 1])
+            mask ^= lowest
+        return skills
+    
+    @staticmethod
+    def _build_vocab(value_sets) -> Dict[str, int]:
+        """Assign a column index to every distinct value, in first-seen order"""
+        vocab = {}
+        for values in value_sets:
+            for value in sorted(values):
+                vocab.setdefault(value, len(vocab))
+        return vocab
+    
+    def _membership_matrix(self, key: str, vocab: Dict[str, int]) -> np.ndarray:
+        """Build a (jobs x vocab) boolean matrix from a precomputed job set"""
+        matrix = np.zeros((len(self.job_database), len(vocab)), dtype=bool)
+        for row, job in enumerate(self.job_database):
+            matrix[row, [vocab[value] for value in job[key]]] = True
+        return matrix
+    
+    @staticmethod
+    def _one_hot(values, vocab: Dict[str, int]) -> np.ndarray:
+        """Encode user values as an indicator vector, ignoring unknown values"""
+        vector = np.zeros(len(vocab), dtype=np.int64)
+        vector[[vocab[value] for value in values if value in vocab]] = 1
+        return vector
     
-    def calculate_match_score(self, user_profile: Dict, job: Dict) -> float:
-        """Calculate comprehensive match score between user and job"""
+    def normalize_profile(self, user_profile: Dict) -> Dict:
+        """Lowercase and encode a raw user profile once for scoring against many jobs"""
+        skills = frozenset(skill.lower() for skill in user_profile.get('skills', []))
+        return {
+            "skills": skills,
+            "skill_mask": self._skill_mask(skills),
+            "exp": user_profile.get('experience_level', '').lower(),
+            "edu": user_profile.get('education', '').lower(),
+            "ind": tuple(sorted({sys.intern(ind.lower()) for ind in user_profile.get('preferred_industries', [])})),
+            "interests_text": ' '.join(user_profile.get('interests', []))
+        }
+    
+    def _score_jobs(self, profiles: List[Dict], interest_sims: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_match_score over the whole job table, one row per profile"""
+        user_skills = np.stack([self._pack_mask(profile['skill_mask']) for profile in profiles])
+        user_industries = np.stack([self._one_hot(profile['ind'], self._industry_vocab) for profile in profiles])
+        user_exp = np.stack([self._one_hot([profile['exp']], self._exp_vocab) for profile in profiles])
+        user_edu = np.stack([self._one_hot([profile['edu']], self._edu_vocab) for profile in profiles])
+        
+        # (profiles x jobs x words) AND, then popcount over the words
+        required_hits = self._popcount_rows(np.bitwise_and(self._req_bits[None, :, :], user_skills[:, None, :]))
+        preferred_hits = self._popcount_rows(np.bitwise_and(self._pref_bits[None, :, :], user_skills[:, None, :]))
+        
+        required_match = np.divide(required_hits, self._req_sizes,
+                                   out=np.zeros(required_hits.shape), where=self._req_sizes > 0)
+        preferred_match = np.divide(preferred_hits, self._pref_sizes,
+                                    out=np.zeros(preferred_hits.shape), where=self._pref_sizes > 0)
+        
+        # Same weights, in the same order, as calculate_match_score
+        scores = (required_match * 0.7 + preferred_match * 0.3) * 0.4
+        scores += (user_exp @ self._exp_matrix.T > 0) * 0.2
+        scores += (user_edu @ self._edu_matrix.T > 0) * 0.15
+        scores += (user_industries @ self._industry_matrix.T > 0) * 0.15
+        scores += interest_sims * 0.1
+        
+        return np.minimum(scores * 100, 100)
+    
+    def _interest_sims(self, user_texts: List[str]) -> np.ndarray:
+        """Cosine similarity between each user's interests and every job (users x jobs)"""
+        # TF-IDF rows are L2-normalized, so a plain sparse dot product is
+        # already the cosine similarity. The users x jobs result stays sparse
+        # and only its non-zero entries are scattered into the output
+        interest_sims = np.zeros((len(user_texts), len(self.job_database)))
+        texts = [(row, text) for row, text in enumerate(user_texts) if text]
+        if texts:
+            rows, texts = zip(*texts)
+            user_vectors = self.vectorizer.transform(texts)
+            similarities = (user_vectors @ self.job_vectors.T).tocoo()
+            interest_sims[np.asarray(rows)[similarities.row], similarities.col] = similarities.data
+        return interest_sims
+    
+    def calculate_match_score(self, profile: Dict, job: Dict, interest_sim: Optional[float] = None) -> float:
+        """Calculate comprehensive match score between user and job
+        
+        ``profile`` is a user profile as returned by ``normalize_profile``.
+        ``interest_sim`` is the precomputed interest/job text similarity; when
+        omitted it is computed for this job alone.
+        """
         score = 0.0
         
         # Skills matching (40% weight)
-        user_skills = set([skill.lower() for skill in user_profile.get('skills', [])])
-        required_skills = set([skill.lower() for skill in job['required_skills']])
-        preferred_skills = set([skill.lower() for skill in job['preferred_skills']])
+        user_skills = profile['skill_mask']
+        required_len = job['_req_len']
+        preferred_len = job['_pref_len']
         
-        required_match = len(user_skills.intersection(required_skills)) / len(required_skills) if required_skills else 0
-        preferred_match = len(user_skills.intersection(preferred_skills)) / len(preferred_skills) if preferred_skills else 0
+        required_match = (job['_req_mask'] & user_skills).bit_count() / required_len if required_len else 0
+        preferred_match = (job['_pref_mask'] & user_skills).bit_count() / preferred_len if preferred_len else 0
         
         skills_score = (required_match * 0.7 + preferred_match * 0.3) * 0.4
         score += skills_score
         
         # Experience level matching (20% weight)
-        user_exp = user_profile.get('experience_level', '').lower()
-        if user_exp in job['experience_levels']:
+        if profile['exp'] in job['_exp_lc']:
             score += 0.2
         
         # Education matching (15% weight)
-        user_edu = user_profile.get('education', '').lower()
-        if user_edu in job['education_requirements']:
+        if profile['edu'] in job['_edu_lc']:
             score += 0.15
         
         # Industry preference matching (15% weight)
-        user_industries = set([ind.lower() for ind in user_profile.get('preferred_industries', [])])
-        job_industries = set([ind.lower() for ind in job['industries']])
-        
-        if user_industries.intersection(job_industries):
+        if _sorted_intersection_size(job['_ind_sorted'], profile['ind']):
             score += 0.15
         
         # Interest alignment using text similarity (10% weight)
-        user_text = ' '.join(user_profile.get('interests', []))
-        if user_text:
-            user_vector = self.vectorizer.transform([user_text])
-            job_index = next(i for i, j in enumerate(self.job_database) if j['job_title'] == job['job_title'])
-            similarity = cosine_similarity(user_vector, self.job_vectors[job_index:job_index+1])[0][0]
-            score += similarity * 0.1
+        if interest_sim is None and profile['interests_text']:
+            interest_sim = self._interest_sims([profile['interests_text']])[0, self._title_to_index[job['job_title']]]
+        if interest_sim:
+            score += interest_sim * 0.1
         
         return min(score * 100, 100)  # Convert to percentage and cap at 100
     
     def get_recommendations(self, user_profile: Dict, top_n: int = 5) -> List[Dict]:
         """Get top N career recommendations for user"""
-        recommendations = []
+        return self.get_recommendations_batch([user_profile], top_n)[0]
+    
+    def get_recommendations_batch(self, user_profiles: List[Dict], top_n: int = 5) -> List[List[Dict]]:
+        """Get top N career recommendations for each of several users
         
-        for job in self.job_database:
-            match_score = self.calculate_match_score(user_profile, job)
-            
-            recommendation = {
-                "job_title": job["job_title"],
-                "match_percentage": round(match_score, 1),
-                "description": job["description"],
-                "required_skills": job["required_skills"],
-                "salary_range": job["salary_range"],
-                "growth_prospects": job["growth_prospects"],
-                "remote_friendly": job["remote_friendly"],
-                "industries": job["industries"]
-            }
-            recommendations.append(recommendation)
+        All interests are vectorized in one transform and every profile is
+        scored against every job in the same set of array operations.
+        """
+        if not user_profiles:
+            return []
         
-        # Sort by match percentage and return top N
-        recommendations.sort(key=lambda x: x['match_percentage'], reverse=True)
-        return recommendations[:top_n]
+        profiles = [self.normalize_profile(user_profile) for user_profile in user_profiles]
+        interest_sims = self._interest_sims([profile['interests_text'] for profile in profiles])
+        match_scores = self._score_jobs(profiles, interest_sims)
+        
+        results = []
+        for row_scores in match_scores:
+            # Only the top N jobs are turned into result dicts
+            recommendations = []
+            for job_index in self._top_indices(row_scores, top_n):
+                recommendation = {
+                    **self._job_output_cache[job_index],
+                    "match_percentage": round(float(row_scores[job_index]), 1)
+                }
+                recommendations.append(recommendation)
+            results.append(recommendations)
+        
+        return results
+    
+    @staticmethod
+    def _top_indices(match_scores: np.ndarray, top_n: int) -> np.ndarray:
+        """Indices of the top N jobs by rounded match percentage, best first
+        
+        Ties keep job database order, as the previous stable sort did.
+        """
+        if top_n <= 0:
+            return np.empty(0, dtype=np.intp)
+        
+        sort_key = -np.round(match_scores, 1)
+        if top_n < len(sort_key):
+            # O(N) partition to find the cutoff, then sort only the candidates
+            # (everything at or above it, so ties at the cutoff stay stable)
+            cutoff = np.partition(sort_key, top_n - 1)[top_n - 1]
+            candidates = np.flatnonzero(sort_key <= cutoff)
+        else:
+            candidates = np.arange(len(sort_key))
+        
+        order = np.argsort(sort_key[candidates], kind='stable')
+        return candidates[order[:top_n]]
     
     def get_skill_recommendations(self, user_profile: Dict, target_job: str) -> List[str]:
         """Get skill recommendations for a specific target job"""
-        target_job_data = next((job for job in self.job_database if job['job_title'] == target_job), None)
+        job_index = self._title_to_index.get(target_job)
         
-        if not target_job_data:
+        if job_index is None:
             return []
         
-        user_skills = set([skill.lower() for skill in user_profile.get('skills', [])])
-        required_skills = set([skill.lower() for skill in target_job_data['required_skills']])
-        preferred_skills = set([skill.lower() for skill in target_job_data['preferred_skills']])
+        target_job_data = self.job_database[job_index]
+        
+        user_skills = self._skill_mask(skill.lower() for skill in user_profile.get('skills', []))
         
-        missing_required = required_skills - user_skills
-        missing_preferred = preferred_skills - user_skills
+        missing_required = target_job_data['_req_mask'] & ~user_skills
+        missing_preferred = target_job_data['_pref_mask'] & ~user_skills
         
-        recommendations = list(missing_required) + list(missing_preferred)
+        recommendations = self._mask_to_skills(missing_required) + self._mask_to_skills(missing_preferred)
         return recommendations[:10]  # Return top 10 skill recommendations
\ No newline at end of file
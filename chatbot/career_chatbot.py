@@ -2,13 +2,28 @@ import re
 import json
 from typing import Dict, List, Any
 import random
+import threading
+from collections import deque
 
 class CareerChatbot:
-    def __init__(self):
-        self.conversation_history = []
+    def __init__(self, max_history: int = 200):
+        # Bounded so long-running sessions don't grow memory without limit;
+        # the counters and intents seen keep summary stats exact after old
+        # entries are evicted
+        self.conversation_history = deque(maxlen=max_history)
+        self._msg_count = 0
+        self._user_msg_count = 0
+        self._intents_seen = {}
         self.user_context = {}
+        # Messages are processed on threadpool threads, so history, counters
+        # and context are only touched while holding this lock
+        self._lock = threading.Lock()
         self.response_templates = self._load_response_templates()
         self.career_knowledge = self._load_career_knowledge()
+        self._knowledge_blob = {key: "\n".join(items[:5]) for key, items in self.career_knowledge.items()}
+        self.general_responses = self._load_general_responses()
+        self.intent_patterns = self._load_intent_patterns()
+        self._prepare_intent_responses()
     
     def _load_response_templates(self) -> Dict:
         """Load response templates for different types of queries"""
@@ -109,31 +124,9 @@ class CareerChatbot:
             ]
         }
     
-    def process_message(self, message: str, user_context: Dict = None) -> str:
-        """Process user message and generate appropriate response"""
-        if user_context:
-            self.user_context.update(user_context)
-        
-        # Add to conversation history
-        self.conversation_history.append({"role": "user", "message": message})
-        
-        # Analyze message intent
-        intent = self._analyze_intent(message)
-        
-        # Generate response based on intent
-        response = self._generate_response(intent, message)
-        
-        # Add response to history
-        self.conversation_history.append({"role": "assistant", "message": response})
-        
-        return response
-    
-    def _analyze_intent(self, message: str) -> str:
-        """Analyze user message to determine intent"""
-        message_lower = message.lower()
-        
-        # Define intent patterns
-        intent_patterns = {
+    def _load_intent_patterns(self) -> Dict:
+        """Load keyword patterns for each intent, in priority order"""
+        return {
             "career_change": [
                 "career change", "switch career", "change job", "new career",
                 "different field", "career transition", "pivot"
@@ -163,9 +156,57 @@ class CareerChatbot:
                 "balance", "wellness", "mental health"
             ]
         }
+    
+    def _prepare_intent_responses(self):
+        """Precompute the template choices and knowledge body for each intent"""
+        self._intent_prefixes = {}
+        self._intent_bodies = {}
+        for intent in self.intent_patterns:
+            self._intent_prefixes[intent] = self.response_templates.get(intent, ["I'd be happy to help with that!"])
+            
+            knowledge_key = f"{intent}_steps" if f"{intent}_steps" in self.career_knowledge else f"{intent}_tips"
+            if knowledge_key not in self.career_knowledge:
+                knowledge_key = list(self.career_knowledge.keys())[0]
+            
+            # Relevant knowledge points (top 5, pre-joined) and a follow-up question
+            knowledge_blob = self._knowledge_blob.get(knowledge_key, "")
+            if knowledge_blob:
+                self._intent_bodies[intent] = (
+                    f"{knowledge_blob}\n\nWould you like me to elaborate on any of these points "
+                    f"or help you with something specific related to {intent.replace('_', ' ')}?"
+                )
+            else:
+                self._intent_bodies[intent] = ""
+    
+    def process_message(self, message: str, user_context: Dict = None) -> str:
+        """Process user message and generate appropriate response"""
+        # Analyze message intent
+        intent = self._analyze_intent(message.lower())
+        
+        with self._lock:
+            if user_context:
+                self.user_context.update(user_context)
+            
+            # Add to conversation history
+            self.conversation_history.append({"role": "user", "message": message})
+            self._msg_count += 1
+            self._user_msg_count += 1
+            # Ordered like the first time each intent came up
+            self._intents_seen.setdefault(intent)
+            
+            # Generate response based on intent
+            response = self._generate_response(intent, message)
+            
+            # Add response to history
+            self.conversation_history.append({"role": "assistant", "message": response})
+            self._msg_count += 1
         
-        # Check for pattern matches
-        for intent, patterns in intent_patterns.items():
+        return response
+    
+    def _analyze_intent(self, message_lower: str) -> str:
+        """Analyze an already lowercased user message to determine intent"""
+        # Check for pattern matches; the first intent in declaration order wins
+        for intent, patterns in self.intent_patterns.items():
             for pattern in patterns:
                 if pattern in message_lower:
                     return intent
@@ -177,27 +218,9 @@ class CareerChatbot:
         if intent == "general":
             return self._generate_general_response(message)
         
-        # Get appropriate template and knowledge
-        templates = self.response_templates.get(intent, ["I'd be happy to help with that!"])
-        knowledge_key = f"{intent}_steps" if f"{intent}_steps" in self.career_knowledge else f"{intent.replace('_', '_')}_tips"
-        
-        if knowledge_key not in self.career_knowledge:
-            knowledge_key = list(self.career_knowledge.keys())[0]
-        
-        knowledge_items = self.career_knowledge.get(knowledge_key, [])
-        
-        # Select random template
-        template = random.choice(templates)
-        
-        # Build response
-        response = f"{template}\n\n"
-        
-        # Add relevant knowledge points
-        if knowledge_items:
-            for i, item in enumerate(knowledge_items[:5], 1):  # Limit to 5 items
-                response += f"{item}\n"
-            
-            response += f"\nWould you like me to elaborate on any of these points or help you with something specific related to {intent.replace('_', ' ')}?"
+        # Random template followed by the precomputed knowledge body
+        template = random.choice(self._intent_prefixes[intent])
+        response = f"{template}\n\n{self._intent_bodies[intent]}"
         
         # Add personalized touch if user context available
         if self.user_context:
@@ -207,13 +230,15 @@ class CareerChatbot:
     
     def _generate_general_response(self, message: str) -> str:
         """Generate response for general queries"""
-        general_responses = [
+        return random.choice(self.general_responses)
+    
+    def _load_general_responses(self) -> List[str]:
+        """Load fallback responses for queries without a specific intent"""
+        return [
             "I'm here to help with your career questions! I can assist with career planning, job search strategies, skill development, salary negotiation, and more. What specific area would you like to explore?",
             "That's an interesting question! I specialize in career guidance and can help with topics like career transitions, interview preparation, networking, and professional development. How can I assist you today?",
             "I'd be happy to help you with your career-related concerns. I have expertise in areas like job searching, skill building, career planning, and workplace success strategies. What would you like to know more about?"
         ]
-        
-        return random.choice(general_responses)
     
     def _add_personalized_advice(self, intent: str) -> str:
         """Add personalized advice based on user context"""
@@ -245,21 +270,20 @@ class CareerChatbot:
     
     def get_conversation_summary(self) -> Dict:
         """Get summary of conversation for analytics"""
-        intents_discussed = []
-        for entry in self.conversation_history:
-            if entry["role"] == "user":
-                intent = self._analyze_intent(entry["message"])
-                if intent not in intents_discussed:
-                    intents_discussed.append(intent)
-        
-        return {
-            "total_messages": len(self.conversation_history),
-            "intents_discussed": intents_discussed,
-            "user_context": self.user_context,
-            "conversation_length": len([msg for msg in self.conversation_history if msg["role"] == "user"])
-        }
+        with self._lock:
+            # Copy the context so it can be serialized after the lock is released
+            return {
+                "total_messages": self._msg_count,
+                "intents_discussed": list(self._intents_seen),
+                "user_context": dict(self.user_context),
+                "conversation_length": self._user_msg_count
+            }
     
     def reset_conversation(self):
         """Reset conversation history and context"""
-        self.conversation_history = []
-        self.user_context = {}
\ No newline at end of file
+        with self._lock:
+            self.conversation_history.clear()
+            self._msg_count = 0
+            self._user_msg_count = 0
+            self._intents_seen = {}
+            self.user_context = {}
\ No newline at end of file
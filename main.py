@@ -1,25 +1,101 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, Request, Depends
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, ValidationError, create_model
+from typing import List, Dict, Optional, Any, Callable
+from contextlib import asynccontextmanager
+import asyncio
+import anyio
+import email.message
+import json
 import os
+import orjson
+import msgspec
 from dotenv import load_dotenv
 
 # Import our AI modules
 from career_recommendation.recommendation_engine import CareerRecommendationEngine
 from skill_analysis.skill_analyzer import SkillAnalyzer
 from chatbot.career_chatbot import CareerChatbot
-from personality_analysis.personality_analyzer import app as personality_app
+from personality_analysis.personality_analyzer import router as personality_router
 
 load_dotenv()
 
-app = FastAPI(title="Career Advisor AI Services", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Allow more concurrent engine calls than anyio's default of 40 threads
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 64
+    yield
+
+app = FastAPI(title="Career Advisor AI Services", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Initialize AI engines
 recommendation_engine = CareerRecommendationEngine()
 skill_analyzer = SkillAnalyzer()
 career_chatbot = CareerChatbot()
 
+class Batcher:
+    """Collect concurrent requests into batched engine calls
+
+    A request arriving while the engine is idle is dispatched right away,
+    together with anything queued in the same event loop tick. While
+    ``max_concurrent`` batches are running, new items queue up and are sent
+    as one batch of up to ``max_batch_size`` when a runner frees up.
+    ``batch_fn`` must return one result per item, in order.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 16, max_concurrent: int = 4):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_concurrent = max_concurrent
+        self._pending = []
+        self._running = 0
+        self._tasks = set()
+        self._loop = None
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        # Queued futures and runners belong to the event loop they started on
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._running = 0
+            self._tasks = set()
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if self._running < self.max_concurrent:
+            self._running += 1
+            task = loop.create_task(self._run())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await future
+
+    async def _run(self):
+        try:
+            while self._pending:
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+
+                try:
+                    # Engine calls are CPU-bound; keep them off the event loop
+                    results = await run_in_threadpool(self.batch_fn, [item for item, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for (_, future), result in zip(batch, results):
+                        if not future.done():
+                            future.set_result(result)
+        finally:
+            self._running -= 1
+
+recommendation_batcher = Batcher(lambda profiles: recommendation_engine.get_recommendations_batch(profiles, top_n=5))
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +105,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads such as the forecasts and recommendations
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
+# Personality quiz, served in-process instead of as a separate app on port 8001
+app.include_router(personality_router, prefix="/personality")
+
 # Data models
 class UserProfile(BaseModel):
     interests: List[str]
@@ -38,6 +120,8 @@ class UserProfile(BaseModel):
     preferred_industries: List[str]
 
 class CareerRecommendation(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     job_title: str
     match_percentage: float
     description: str
@@ -48,6 +132,8 @@ class CareerRecommendation(BaseModel):
     industries: List[str] = []
 
 class SkillGap(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     skill: str
     current_level: int
     required_level: int
@@ -57,10 +143,120 @@ class SkillGap(BaseModel):
     market_demand: int = 5
     difficulty: int = 5
 
+# Defaults for optional fields the engines may omit. Engine output is
+# trusted internal data, so it is returned as plain dicts without validation
+DEFAULTS_REC = {"remote_friendly": True, "industries": []}
+DEFAULTS_GAP = {"estimated_learning_time": 8, "market_demand": 5, "difficulty": 5}
+# Responses are projected onto the model fields, in model field order; gap
+# dicts also carry extra scoring keys that are not part of the response
+_REC_FIELDS = tuple(CareerRecommendation.model_fields)
+_GAP_FIELDS = tuple(SkillGap.model_fields)
+
+# Mock responses served when an AI engine fails, built and serialized once
+_FALLBACK_RECS = [
+    CareerRecommendation(
+        job_title="Data Scientist",
+        match_percentage=92.5,
+        description="Analyze complex data to help organizations make informed decisions",
+        required_skills=["Python", "Machine Learning", "Statistics", "SQL"],
+        salary_range="$80,000 - $150,000",
+        growth_prospects="High demand, 22% growth expected"
+    )
+]
+_FALLBACK_GAPS = [
+    SkillGap(
+        skill="Machine Learning",
+        current_level=3,
+        required_level=7,
+        importance="High",
+        learning_resources=["Coursera ML Course", "Kaggle Learn", "Fast.ai"]
+    )
+]
+_FALLBACK_RECS_JSON = orjson.dumps([rec.model_dump() for rec in _FALLBACK_RECS])
+_FALLBACK_GAPS_JSON = orjson.dumps([gap.model_dump() for gap in _FALLBACK_GAPS])
+
 class ChatMessage(BaseModel):
     message: str
     user_context: Optional[Dict] = None
 
+# Request bodies are decoded straight from bytes with msgspec, which is much
+# cheaper than Pydantic validation. The structs are generated from the
+# Pydantic models above, which stay the documented OpenAPI schema
+def struct_for(model: type) -> type:
+    """msgspec Struct with the same fields and defaults as a Pydantic model"""
+    fields = [
+        (name, field.annotation) if field.is_required() else (name, field.annotation, field.default)
+        for name, field in model.model_fields.items()
+    ]
+    return msgspec.defstruct(f"{model.__name__}Struct", fields)
+
+UserProfileStruct = struct_for(UserProfile)
+ChatMessageStruct = struct_for(ChatMessage)
+
+def is_json_content_type(content_type: Optional[str]) -> bool:
+    """Whether FastAPI would parse a body with this Content-Type as JSON"""
+    if not content_type:
+        return True
+    message = email.message.Message()
+    message["content-type"] = content_type
+    if message.get_content_maintype() != "application":
+        return False
+    subtype = message.get_content_subtype()
+    return subtype == "json" or subtype.endswith("+json")
+
+def json_body(model: type, struct_type: type) -> Callable:
+    """Dependency that decodes the JSON request body into ``struct_type``
+
+    Bodies msgspec rejects, or that aren't sent as JSON, are validated with
+    ``model`` instead, so clients get FastAPI's usual 422 error list.
+    """
+    decoder = msgspec.json.Decoder(struct_type)
+    # Nesting the model under "body" gives errors the loc FastAPI uses
+    body_model = create_model(f"{model.__name__}Body", body=(model, ...))
+    
+    async def decode(request: Request):
+        raw = await request.body()
+        # Like FastAPI, only JSON content types are parsed; anything else,
+        # such as text/plain posts that skip the CORS preflight, is
+        # validated as raw bytes and rejected
+        is_json = is_json_content_type(request.headers.get("content-type"))
+        if is_json:
+            try:
+                return decoder.decode(raw)
+            except msgspec.DecodeError:
+                pass
+        
+        if not raw:
+            data = None
+        elif not is_json:
+            data = raw
+        else:
+            try:
+                data = json.loads(raw)
+            except json.JSONDecodeError as e:
+                raise RequestValidationError(
+                    [{"type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error", "input": {}, "ctx": {"error": e.msg}}],
+                    body=e.doc
+                )
+        
+        try:
+            validated = body_model.model_validate({} if data is None else {"body": data}, from_attributes=True).body
+        except ValidationError as e:
+            errors = e.errors()
+            if data is None:
+                # A missing body is reported with a null input, as FastAPI does
+                errors = [{**error, "input": None} for error in errors]
+            raise RequestValidationError(errors, body=data)
+        
+        # Pydantic accepted a body msgspec's stricter decoding did not
+        return msgspec.convert(validated.model_dump(), struct_type)
+    
+    return decode
+
+def body_schema(model: type) -> Dict[str, Any]:
+    """openapi_extra documenting ``model`` as the JSON request body"""
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": model.model_json_schema()}}}}
+
 class PersonalityResponse(BaseModel):
     responses: Dict[int, str]
 
@@ -68,84 +264,42 @@ class PersonalityResponse(BaseModel):
 async def root():
     return {"message": "Career Advisor AI Services API - Enhanced with ML"}
 
-@app.post("/career-recommendations")
-async def get_career_recommendations(profile: UserProfile) -> List[CareerRecommendation]:
+@app.post("/career-recommendations", response_model=None, responses={200: {"model": List[CareerRecommendation]}},
+          openapi_extra=body_schema(UserProfile))
+async def get_career_recommendations(profile: UserProfileStruct = Depends(json_body(UserProfile, UserProfileStruct))) -> List[Dict[str, Any]]:
     try:
-        # Convert Pydantic model to dict
-        profile_dict = profile.dict()
+        # Convert request struct to dict
+        profile_dict = msgspec.structs.asdict(profile)
         
         # Get recommendations from AI engine
-        recommendations = recommendation_engine.get_recommendations(profile_dict, top_n=5)
+        recommendations = await recommendation_batcher.submit(profile_dict)
         
-        # Convert to Pydantic models
-        result = []
-        for rec in recommendations:
-            result.append(CareerRecommendation(
-                job_title=rec["job_title"],
-                match_percentage=rec["match_percentage"],
-                description=rec["description"],
-                required_skills=rec["required_skills"],
-                salary_range=rec["salary_range"],
-                growth_prospects=rec["growth_prospects"],
-                remote_friendly=rec.get("remote_friendly", True),
-                industries=rec.get("industries", [])
-            ))
-        
-        return result
+        return [{field: rec[field] if field in rec else DEFAULTS_REC[field] for field in _REC_FIELDS} for rec in recommendations]
     except Exception as e:
         # Fallback to mock data if AI engine fails
-        return [
-            CareerRecommendation(
-                job_title="Data Scientist",
-                match_percentage=92.5,
-                description="Analyze complex data to help organizations make informed decisions",
-                required_skills=["Python", "Machine Learning", "Statistics", "SQL"],
-                salary_range="$80,000 - $150,000",
-                growth_prospects="High demand, 22% growth expected"
-            )
-        ]
-
-@app.post("/skill-gap-analysis")
-async def analyze_skill_gaps(profile: UserProfile) -> List[SkillGap]:
+        return Response(_FALLBACK_RECS_JSON, media_type="application/json")
+
+@app.post("/skill-gap-analysis", response_model=None, responses={200: {"model": List[SkillGap]}},
+          openapi_extra=body_schema(UserProfile))
+async def analyze_skill_gaps(profile: UserProfileStruct = Depends(json_body(UserProfile, UserProfileStruct))) -> List[Dict[str, Any]]:
     try:
-        # Convert Pydantic model to dict
-        profile_dict = profile.dict()
+        # Convert request struct to dict
+        profile_dict = msgspec.structs.asdict(profile)
         
         # Get skill gap analysis from AI engine
-        gaps = skill_analyzer.analyze_skill_gaps(profile_dict)
+        gaps = await run_in_threadpool(skill_analyzer.analyze_skill_gaps, profile_dict)
         
-        # Convert to Pydantic models
-        result = []
-        for gap in gaps:
-            result.append(SkillGap(
-                skill=gap["skill"],
-                current_level=gap["current_level"],
-                required_level=gap["required_level"],
-                importance=gap["importance"],
-                learning_resources=gap["learning_resources"],
-                estimated_learning_time=gap.get("estimated_learning_time", 8),
-                market_demand=gap.get("market_demand", 5),
-                difficulty=gap.get("difficulty", 5)
-            ))
-        
-        return result
+        return [{field: gap[field] if field in gap else DEFAULTS_GAP[field] for field in _GAP_FIELDS} for gap in gaps]
     except Exception as e:
         # Fallback to mock data
-        return [
-            SkillGap(
-                skill="Machine Learning",
-                current_level=3,
-                required_level=7,
-                importance="High",
-                learning_resources=["Coursera ML Course", "Kaggle Learn", "Fast.ai"]
-            )
-        ]
-
-@app.post("/chat")
-async def chat_with_advisor(message: ChatMessage) -> Dict[str, str]:
+        return Response(_FALLBACK_GAPS_JSON, media_type="application/json")
+
+@app.post("/chat", openapi_extra=body_schema(ChatMessage))
+async def chat_with_advisor(message: ChatMessageStruct = Depends(json_body(ChatMessage, ChatMessageStruct))) -> Dict[str, str]:
     try:
         # Get response from AI chatbot
-        response = career_chatbot.process_message(
+        response = await run_in_threadpool(
+            career_chatbot.process_message,
             message.message, 
             message.user_context
         )
@@ -154,112 +308,114 @@ async def chat_with_advisor(message: ChatMessage) -> Dict[str, str]:
         # Fallback response
         return {"response": "I'm here to help with your career questions! Ask me about career paths, skills, or job market trends."}
 
+# Enhanced job forecasting data with category information
+JOB_FORECASTS = [
+    {
+        "job_title": "AI/ML Engineer",
+        "growth_rate": 35,
+        "demand_level": "Very High",
+        "avg_salary": "$120,000",
+        "key_skills": ["Python", "TensorFlow", "Deep Learning", "MLOps"],
+        "trend": "Rapidly Growing",
+        "category": "technology"
+    },
+    {
+        "job_title": "Cybersecurity Specialist",
+        "growth_rate": 28,
+        "demand_level": "High",
+        "avg_salary": "$95,000",
+        "key_skills": ["Network Security", "Ethical Hacking", "Risk Assessment", "Compliance"],
+        "trend": "Consistently Growing",
+        "category": "technology"
+    },
+    {
+        "job_title": "Data Analyst",
+        "growth_rate": 23,
+        "demand_level": "High",
+        "avg_salary": "$75,000",
+        "key_skills": ["SQL", "Excel", "Tableau", "Python", "Statistics"],
+        "trend": "Steady Growth",
+        "category": "technology"
+    },
+    {
+        "job_title": "Cloud Solutions Architect",
+        "growth_rate": 30,
+        "demand_level": "Very High",
+        "avg_salary": "$130,000",
+        "key_skills": ["AWS", "Azure", "System Design", "DevOps"],
+        "trend": "Rapidly Growing",
+        "category": "technology"
+    },
+    {
+        "job_title": "Product Manager",
+        "growth_rate": 19,
+        "demand_level": "High",
+        "avg_salary": "$110,000",
+        "key_skills": ["Product Strategy", "Analytics", "Agile", "Leadership"],
+        "trend": "Steady Growth",
+        "category": "technology"
+    },
+    {
+        "job_title": "Nurse Practitioner",
+        "growth_rate": 45,
+        "demand_level": "Very High",
+        "avg_salary": "$85,000",
+        "key_skills": ["Patient Care", "Medical Knowledge", "Communication", "Critical Thinking"],
+        "trend": "Rapidly Growing",
+        "category": "healthcare"
+    },
+    {
+        "job_title": "Physical Therapist",
+        "growth_rate": 32,
+        "demand_level": "High",
+        "avg_salary": "$78,000",
+        "key_skills": ["Rehabilitation", "Anatomy", "Patient Assessment", "Treatment Planning"],
+        "trend": "Rapidly Growing",
+        "category": "healthcare"
+    },
+    {
+        "job_title": "Financial Analyst",
+        "growth_rate": 15,
+        "demand_level": "Medium",
+        "avg_salary": "$72,000",
+        "key_skills": ["Financial Modeling", "Excel", "Data Analysis", "Risk Assessment"],
+        "trend": "Steady Growth",
+        "category": "finance"
+    },
+    {
+        "job_title": "Investment Advisor",
+        "growth_rate": 18,
+        "demand_level": "High",
+        "avg_salary": "$95,000",
+        "key_skills": ["Portfolio Management", "Client Relations", "Market Analysis", "Compliance"],
+        "trend": "Steady Growth",
+        "category": "finance"
+    },
+    {
+        "job_title": "Special Education Teacher",
+        "growth_rate": 22,
+        "demand_level": "High",
+        "avg_salary": "$58,000",
+        "key_skills": ["Special Needs Education", "IEP Development", "Patience", "Communication"],
+        "trend": "Consistently Growing",
+        "category": "education"
+    }
+]
+
+# Forecasts never change at runtime, so group and serialize them once
+_FORECASTS_BY_CATEGORY = {"all": JOB_FORECASTS}
+for _forecast in JOB_FORECASTS:
+    _FORECASTS_BY_CATEGORY.setdefault(_forecast["category"], []).append(_forecast)
+_FORECAST_JSON = {category: orjson.dumps(forecasts) for category, forecasts in _FORECASTS_BY_CATEGORY.items()}
+
 @app.get("/job-forecasting")
 async def get_job_forecasting(category: str = "all") -> List[Dict[str, Any]]:
-    # Enhanced job forecasting data with category information
-    all_forecasts = [
-        {
-            "job_title": "AI/ML Engineer",
-            "growth_rate": 35,
-            "demand_level": "Very High",
-            "avg_salary": "$120,000",
-            "key_skills": ["Python", "TensorFlow", "Deep Learning", "MLOps"],
-            "trend": "Rapidly Growing",
-            "category": "technology"
-        },
-        {
-            "job_title": "Cybersecurity Specialist",
-            "growth_rate": 28,
-            "demand_level": "High",
-            "avg_salary": "$95,000",
-            "key_skills": ["Network Security", "Ethical Hacking", "Risk Assessment", "Compliance"],
-            "trend": "Consistently Growing",
-            "category": "technology"
-        },
-        {
-            "job_title": "Data Analyst",
-            "growth_rate": 23,
-            "demand_level": "High",
-            "avg_salary": "$75,000",
-            "key_skills": ["SQL", "Excel", "Tableau", "Python", "Statistics"],
-            "trend": "Steady Growth",
-            "category": "technology"
-        },
-        {
-            "job_title": "Cloud Solutions Architect",
-            "growth_rate": 30,
-            "demand_level": "Very High",
-            "avg_salary": "$130,000",
-            "key_skills": ["AWS", "Azure", "System Design", "DevOps"],
-            "trend": "Rapidly Growing",
-            "category": "technology"
-        },
-        {
-            "job_title": "Product Manager",
-            "growth_rate": 19,
-            "demand_level": "High",
-            "avg_salary": "$110,000",
-            "key_skills": ["Product Strategy", "Analytics", "Agile", "Leadership"],
-            "trend": "Steady Growth",
-            "category": "technology"
-        },
-        {
-            "job_title": "Nurse Practitioner",
-            "growth_rate": 45,
-            "demand_level": "Very High",
-            "avg_salary": "$85,000",
-            "key_skills": ["Patient Care", "Medical Knowledge", "Communication", "Critical Thinking"],
-            "trend": "Rapidly Growing",
-            "category": "healthcare"
-        },
-        {
-            "job_title": "Physical Therapist",
-            "growth_rate": 32,
-            "demand_level": "High",
-            "avg_salary": "$78,000",
-            "key_skills": ["Rehabilitation", "Anatomy", "Patient Assessment", "Treatment Planning"],
-            "trend": "Rapidly Growing",
-            "category": "healthcare"
-        },
-        {
-            "job_title": "Financial Analyst",
-            "growth_rate": 15,
-            "demand_level": "Medium",
-            "avg_salary": "$72,000",
-            "key_skills": ["Financial Modeling", "Excel", "Data Analysis", "Risk Assessment"],
-            "trend": "Steady Growth",
-            "category": "finance"
-        },
-        {
-            "job_title": "Investment Advisor",
-            "growth_rate": 18,
-            "demand_level": "High",
-            "avg_salary": "$95,000",
-            "key_skills": ["Portfolio Management", "Client Relations", "Market Analysis", "Compliance"],
-            "trend": "Steady Growth",
-            "category": "finance"
-        },
-        {
-            "job_title": "Special Education Teacher",
-            "growth_rate": 22,
-            "demand_level": "High",
-            "avg_salary": "$58,000",
-            "key_skills": ["Special Needs Education", "IEP Development", "Patience", "Communication"],
-            "trend": "Consistently Growing",
-            "category": "education"
-        }
-    ]
-    
-    # Filter by category
-    if category == "all":
-        return all_forecasts
-    else:
-        return [forecast for forecast in all_forecasts if forecast["category"] == category]
+    return Response(_FORECAST_JSON.get(category, b"[]"), media_type="application/json")
 
 @app.get("/skill-learning-path/{skill_name}")
 async def get_skill_learning_path(skill_name: str, current_level: int = 1, target_level: int = 8):
     try:
-        learning_path = skill_analyzer.get_skill_learning_path(skill_name, current_level, target_level)
+        learning_path = await run_in_threadpool(skill_analyzer.get_skill_learning_path, skill_name, current_level, target_level)
         return learning_path
     except Exception as e:
         return {"error": "Could not generate learning path"}
@@ -267,7 +423,7 @@ async def get_skill_learning_path(skill_name: str, current_level: int = 1, targe
 @app.get("/chatbot/conversation-summary")
 async def get_conversation_summary():
     try:
-        summary = career_chatbot.get_conversation_summary()
+        summary = await run_in_threadpool(career_chatbot.get_conversation_summary)
         return summary
     except Exception as e:
         return {"error": "Could not get conversation summary"}
@@ -282,4 +438,12 @@ async def reset_chatbot():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Chatbot history lives in process memory, so a single worker is the
+    # default; set WORKERS to run more processes when the chat endpoints
+    # don't need to share state. "auto" picks uvloop and httptools when
+    # they are installed
+    workers = int(os.getenv("WORKERS", 1))
+    # Worker processes need an import string; a single worker serves this
+    # module's app directly instead of importing main (and its engines) again
+    target = "main:app" if workers > 1 else app
+    uvicorn.run(target, host="0.0.0.0", port=8000, workers=workers, loop="auto", http="auto")
\ No newline at end of file
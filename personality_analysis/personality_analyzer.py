@@ -1,9 +1,10 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from typing import Dict, List
-import uvicorn
+from collections import Counter
+import orjson
 
-app = FastAPI()
+router = APIRouter()
 
 class PersonalityResult(BaseModel):
     dominant_color: str
@@ -32,51 +33,49 @@ CAREER_MAP = {
     "BLUE": ["Data Analysis", "Engineering", "Research", "Quality Assurance"]
 }
 
-@app.get("/questions")
+STRENGTHS_MAP = {
+    "RED": ["Leadership", "Decision-making", "Results-oriented"],
+    "YELLOW": ["Communication", "Creativity", "Optimism"],
+    "GREEN": ["Teamwork", "Patience", "Reliability"],
+    "BLUE": ["Analysis", "Precision", "Planning"]
+}
+
+WEAKNESSES_MAP = {
+    "RED": ["Impatience", "Dominating"],
+    "YELLOW": ["Disorganized", "Unrealistic"],
+    "GREEN": ["Avoids conflict", "Resistant to change"],
+    "BLUE": ["Overthinking", "Critical"]
+}
+
+COLORS = ("RED", "YELLOW", "GREEN", "BLUE")
+
+# Answer letter (either case) -> color, and everything a result needs per color
+_ANSWER_COLOR = {letter: color for letters, color in zip(("Aa", "Bb", "Cc", "Dd"), COLORS) for letter in letters}
+_PROFILE_BY_COLOR = {
+    color: {"career_suggestions": CAREER_MAP[color], "strengths": STRENGTHS_MAP[color], "weaknesses": WEAKNESSES_MAP[color]}
+    for color in COLORS
+}
+
+# The question list never changes, so serialize it once
+_QUESTIONS_JSON = orjson.dumps({"questions": QUESTIONS})
+
+@router.get("/questions")
 def get_questions():
-    return {"questions": QUESTIONS}
+    return Response(_QUESTIONS_JSON, media_type="application/json")
 
-@app.post("/analyze", response_model=PersonalityResult)
+# Results are built from trusted static data, so skip response validation
+# and keep PersonalityResult only for the OpenAPI schema
+@router.post("/analyze", response_model=None, responses={200: {"model": PersonalityResult}})
 def analyze_personality(responses: Dict[int, str]):
-    scores = {"RED": 0, "YELLOW": 0, "GREEN": 0, "BLUE": 0}
-    
-    for answer in responses.values():
-        if answer.upper() == "A":
-            scores["RED"] += 1
-        elif answer.upper() == "B":
-            scores["YELLOW"] += 1
-        elif answer.upper() == "C":
-            scores["GREEN"] += 1
-        elif answer.upper() == "D":
-            scores["BLUE"] += 1
+    counts = Counter(_ANSWER_COLOR[answer] for answer in responses.values() if answer in _ANSWER_COLOR)
+    scores = {color: counts.get(color, 0) for color in COLORS}
     
     dominant = max(scores, key=scores.get)
     
-    return PersonalityResult(
-        dominant_color=dominant,
-        scores=scores,
-        career_suggestions=CAREER_MAP[dominant],
-        strengths=get_strengths(dominant),
-        weaknesses=get_weaknesses(dominant)
-    )
+    return {"dominant_color": dominant, "scores": scores, **_PROFILE_BY_COLOR[dominant]}
 
 def get_strengths(color: str) -> List[str]:
-    strengths_map = {
-        "RED": ["Leadership", "Decision-making", "Results-oriented"],
-        "YELLOW": ["Communication", "Creativity", "Optimism"],
-        "GREEN": ["Teamwork", "Patience", "Reliability"],
-        "BLUE": ["Analysis", "Precision", "Planning"]
-    }
-    return strengths_map.get(color, [])
+    return STRENGTHS_MAP.get(color, [])
 
 def get_weaknesses(color: str) -> List[str]:
-    weaknesses_map = {
-        "RED": ["Impatience", "Dominating"],
-        "YELLOW": ["Disorganized", "Unrealistic"],
-        "GREEN": ["Avoids conflict", "Resistant to change"],
-        "BLUE": ["Overthinking", "Critical"]
-    }
-    return weaknesses_map.get(color, [])
-
-if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    return WEAKNESSES_MAP.get(color, [])
\ No newline at end of file
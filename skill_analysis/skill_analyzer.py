@@ -1,145 +1,264 @@
-import pandas as pd
-import numpy as np
 from typing import List, Dict, Any
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
 import json
+import sys
+
+# Static skill data, built once at import and shared by every SkillAnalyzer;
+# lists are tuples so the shared data can't be mutated by callers
+_SKILL_DB = {
+    "Python": {
+        "category": "Programming",
+        "difficulty": 6,
+        "market_demand": 9,
+        "avg_learning_time_weeks": 12,
+        "related_skills": ("Data Science", "Machine Learning", "Web Development"),
+        "job_roles": ("Data Scientist", "Software Engineer", "Backend Developer")
+    },
+    "Machine Learning": {
+        "category": "AI/Data Science",
+        "difficulty": 8,
+        "market_demand": 10,
+        "avg_learning_time_weeks": 16,
+        "related_skills": ("Python", "Statistics", "Data Analysis"),
+        "job_roles": ("Data Scientist", "ML Engineer", "AI Researcher")
+    },
+    "JavaScript": {
+        "category": "Programming",
+        "difficulty": 5,
+        "market_demand": 9,
+        "avg_learning_time_weeks": 10,
+        "related_skills": ("HTML", "CSS", "React", "Node.js"),
+        "job_roles": ("Frontend Developer", "Full Stack Developer", "Web Developer")
+    },
+    "Project Management": {
+        "category": "Management",
+        "difficulty": 6,
+        "market_demand": 8,
+        "avg_learning_time_weeks": 8,
+        "related_skills": ("Leadership", "Communication", "Agile"),
+        "job_roles": ("Project Manager", "Product Manager", "Scrum Master")
+    },
+    "Data Analysis": {
+        "category": "Analytics",
+        "difficulty": 6,
+        "market_demand": 9,
+        "avg_learning_time_weeks": 10,
+        "related_skills": ("SQL", "Excel", "Statistics", "Visualization"),
+        "job_roles": ("Data Analyst", "Business Analyst", "Research Analyst")
+    },
+    "Cloud Computing": {
+        "category": "Infrastructure",
+        "difficulty": 7,
+        "market_demand": 9,
+        "avg_learning_time_weeks": 14,
+        "related_skills": ("AWS", "Azure", "DevOps", "Networking"),
+        "job_roles": ("Cloud Engineer", "DevOps Engineer", "Solutions Architect")
+    },
+    "Communication": {
+        "category": "Soft Skills",
+        "difficulty": 4,
+        "market_demand": 10,
+        "avg_learning_time_weeks": 6,
+        "related_skills": ("Leadership", "Presentation", "Writing"),
+        "job_roles": ("Manager", "Consultant", "Sales Representative")
+    },
+    "Cybersecurity": {
+        "category": "Security",
+        "difficulty": 8,
+        "market_demand": 10,
+        "avg_learning_time_weeks": 18,
+        "related_skills": ("Networking", "Risk Assessment", "Compliance"),
+        "job_roles": ("Security Analyst", "Security Engineer", "CISO")
+    }
+}
+
+_LEARNING_RES = {
+    "Python": (
+        "Python.org Official Tutorial",
+        "Codecademy Python Course",
+        "Real Python",
+        "Python Crash Course Book",
+        "Automate the Boring Stuff"
+    ),
+    "Machine Learning": (
+        "Coursera ML Course (Andrew Ng)",
+        "Fast.ai Practical Deep Learning",
+        "Kaggle Learn",
+        "Scikit-learn Documentation",
+        "Hands-On Machine Learning Book"
+    ),
+    "JavaScript": (
+        "MDN Web Docs",
+        "freeCodeCamp",
+        "JavaScript.info",
+        "Eloquent JavaScript Book",
+        "You Don't Know JS Series"
+    ),
+    "Project Management": (
+        "PMI Certification Courses",
+        "Coursera Project Management",
+        "Agile Alliance Resources",
+        "Scrum.org Training",
+        "LinkedIn Learning PM Courses"
+    ),
+    "Data Analysis": (
+        "Kaggle Learn Data Analysis",
+        "Coursera Data Analysis Specialization",
+        "Excel Training Resources",
+        "Tableau Public Training",
+        "Google Analytics Academy"
+    ),
+    "Cloud Computing": (
+        "AWS Training and Certification",
+        "Microsoft Azure Learning",
+        "Google Cloud Training",
+        "Cloud Guru Courses",
+        "Linux Academy"
+    ),
+    "Communication": (
+        "Toastmasters International",
+        "Coursera Communication Courses",
+        "Dale Carnegie Training",
+        "TED Talks on Communication",
+        "Harvard Business Review Articles"
+    ),
+    "Cybersecurity": (
+        "Cybrary Free Courses",
+        "SANS Training",
+        "CompTIA Security+ Certification",
+        "Offensive Security Training",
+        "NIST Cybersecurity Framework"
+    )
+}
+
+# Required skill levels per target role, read-only since it is shared
+_ROLE_REQUIREMENTS = MappingProxyType({
+    'Data Scientist': MappingProxyType({
+        'Python': 8, 'Machine Learning': 8, 'Statistics': 7,
+        'Data Analysis': 8, 'Communication': 6
+    }),
+    'Software Engineer': MappingProxyType({
+        'Programming': 8, 'JavaScript': 7, 'Python': 6,
+        'Problem Solving': 8, 'Communication': 6
+    }),
+    'Project Manager': MappingProxyType({
+        'Project Management': 9, 'Communication': 9, 'Leadership': 8,
+        'Agile': 7, 'Risk Management': 6
+    }),
+    'Data Analyst': MappingProxyType({
+        'Data Analysis': 8, 'SQL': 7, 'Excel': 7,
+        'Statistics': 6, 'Communication': 7
+    }),
+    'Cybersecurity Analyst': MappingProxyType({
+        'Cybersecurity': 8, 'Network Security': 7, 'Risk Assessment': 7,
+        'Incident Response': 6, 'Compliance': 6
+    })
+})
+
+# Base skill level for each experience level
+_BASE_LEVELS = MappingProxyType({
+    'entry': 3,
+    'mid': 5,
+    'senior': 7,
+    'executive': 8
+})
+
+# Target roles for interest keywords; a keyword matches anywhere in an interest
+_INTEREST_ROLES = {
+    'technology': ('Software Engineer', 'Data Scientist'),
+    'data': ('Data Scientist', 'Data Analyst'),
+    'management': ('Project Manager', 'Product Manager'),
+    'design': ('UX Designer', 'Product Designer'),
+    'security': ('Cybersecurity Analyst', 'Security Engineer')
+}
+_DEFAULT_TARGET_ROLES = ('Software Engineer', 'Data Analyst')
+
+@lru_cache(maxsize=1024)
+def _roles_for_interest(interest: str) -> tuple:
+    """Roles for one lowercased interest, in keyword order"""
+    return tuple(role for key, roles in _INTEREST_ROLES.items() if key in interest for role in roles)
+
+# Interned lowercase key for every known skill name, so the tables below and
+# the gap loop share one key object per skill instead of lowering again
+_SKILL_KEYS = {
+    skill: sys.intern(skill.lower())
+    for skill in (*_SKILL_DB, *_LEARNING_RES, *(skill for reqs in _ROLE_REQUIREMENTS.values() for skill in reqs))
+}
+
+# Lowercase-keyed views for case-insensitive lookups on the hot path
+_SKILL_DB_LOWER = {_SKILL_KEYS[skill]: info for skill, info in _SKILL_DB.items()}
+_RES_LOWER = {_SKILL_KEYS[skill]: resources for skill, resources in _LEARNING_RES.items()}
+# Shared fallback for missing lookups, read-only so callers can't fill it in
+_EMPTY = MappingProxyType({})
+
+# First three resources per skill, shared by every learning path milestone
+_TOP3_RES = {skill: resources[:3] for skill, resources in _LEARNING_RES.items()}
+
+# Per-skill importance weight for gap scoring; gap importance is this weight
+# times the gap size, and skills missing from _SKILL_DB use market demand and
+# difficulty of 5
+_SKILL_WEIGHTS = {
+    _SKILL_KEYS[skill]: info['market_demand'] * 0.7 + (10 - info['difficulty']) * 0.3
+    for skill, info in _SKILL_DB.items()
+}
+_DEFAULT_WEIGHT = 5 * 0.7 + (10 - 5) * 0.3
+
+def _priority(importance_score: float) -> str:
+    """Priority label for a gap importance score"""
+    if importance_score >= 7:
+        return 'High'
+    if importance_score >= 4:
+        return 'Medium'
+    return 'Low'
 
 class SkillAnalyzer:
     def __init__(self):
         self.skill_database = self._load_skill_database()
         self.learning_resources = self._load_learning_resources()
+        # Interest-derived analyses are deterministic per profile, so repeat
+        # submissions of the same profile are served from here
+        self._cached_gaps = lru_cache(maxsize=4096)(self._analyze_profile_key)
     
     def _load_skill_database(self) -> Dict:
         """Load comprehensive skill database with market demand and difficulty"""
-        return {
-            "Python": {
-                "category": "Programming",
-                "difficulty": 6,
-                "market_demand": 9,
-                "avg_learning_time_weeks": 12,
-                "related_skills": ["Data Science", "Machine Learning", "Web Development"],
-                "job_roles": ["Data Scientist", "Software Engineer", "Backend Developer"]
-            },
-            "Machine Learning": {
-                "category": "AI/Data Science",
-                "difficulty": 8,
-                "market_demand": 10,
-                "avg_learning_time_weeks": 16,
-                "related_skills": ["Python", "Statistics", "Data Analysis"],
-                "job_roles": ["Data Scientist", "ML Engineer", "AI Researcher"]
-            },
-            "JavaScript": {
-                "category": "Programming",
-                "difficulty": 5,
-                "market_demand": 9,
-                "avg_learning_time_weeks": 10,
-                "related_skills": ["HTML", "CSS", "React", "Node.js"],
-                "job_roles": ["Frontend Developer", "Full Stack Developer", "Web Developer"]
-            },
-            "Project Management": {
-                "category": "Management",
-                "difficulty": 6,
-                "market_demand": 8,
-                "avg_learning_time_weeks": 8,
-                "related_skills": ["Leadership", "Communication", "Agile"],
-                "job_roles": ["Project Manager", "Product Manager", "Scrum Master"]
-            },
-            "Data Analysis": {
-                "category": "Analytics",
-                "difficulty": 6,
-                "market_demand": 9,
-                "avg_learning_time_weeks": 10,
-                "related_skills": ["SQL", "Excel", "Statistics", "Visualization"],
-                "job_roles": ["Data Analyst", "Business Analyst", "Research Analyst"]
-            },
-            "Cloud Computing": {
-                "category": "Infrastructure",
-                "difficulty": 7,
-                "market_demand": 9,
-                "avg_learning_time_weeks": 14,
-                "related_skills": ["AWS", "Azure", "DevOps", "Networking"],
-                "job_roles": ["Cloud Engineer", "DevOps Engineer", "Solutions Architect"]
-            },
-            "Communication": {
-                "category": "Soft Skills",
-                "difficulty": 4,
-                "market_demand": 10,
-                "avg_learning_time_weeks": 6,
-                "related_skills": ["Leadership", "Presentation", "Writing"],
-                "job_roles": ["Manager", "Consultant", "Sales Representative"]
-            },
-            "Cybersecurity": {
-                "category": "Security",
-                "difficulty": 8,
-                "market_demand": 10,
-                "avg_learning_time_weeks": 18,
-                "related_skills": ["Networking", "Risk Assessment", "Compliance"],
-                "job_roles": ["Security Analyst", "Security Engineer", "CISO"]
-            }
-        }
+        return _SKILL_DB
     
     def _load_learning_resources(self) -> Dict:
         """Load learning resources for different skills"""
-        return {
-            "Python": [
-                "Python.org Official Tutorial",
-                "Codecademy Python Course",
-                "Real Python",
-                "Python Crash Course Book",
-                "Automate the Boring Stuff"
-            ],
-            "Machine Learning": [
-                "Coursera ML Course (Andrew Ng)",
-                "Fast.ai Practical Deep Learning",
-                "Kaggle Learn",
-                "Scikit-learn Documentation",
-                "Hands-On Machine Learning Book"
-            ],
-            "JavaScript": [
-                "MDN Web Docs",
-                "freeCodeCamp",
-                "JavaScript.info",
-                "Eloquent JavaScript Book",
-                "You Don't Know JS Series"
-            ],
-            "Project Management": [
-                "PMI Certification Courses",
-                "Coursera Project Management",
-                "Agile Alliance Resources",
-                "Scrum.org Training",
-                "LinkedIn Learning PM Courses"
-            ],
-            "Data Analysis": [
-                "Kaggle Learn Data Analysis",
-                "Coursera Data Analysis Specialization",
-                "Excel Training Resources",
-                "Tableau Public Training",
-                "Google Analytics Academy"
-            ],
-            "Cloud Computing": [
-                "AWS Training and Certification",
-                "Microsoft Azure Learning",
-                "Google Cloud Training",
-                "Cloud Guru Courses",
-                "Linux Academy"
-            ],
-            "Communication": [
-                "Toastmasters International",
-                "Coursera Communication Courses",
-                "Dale Carnegie Training",
-                "TED Talks on Communication",
-                "Harvard Business Review Articles"
-            ],
-            "Cybersecurity": [
-                "Cybrary Free Courses",
-                "SANS Training",
-                "CompTIA Security+ Certification",
-                "Offensive Security Training",
-                "NIST Cybersecurity Framework"
-            ]
-        }
+        return _LEARNING_RES
     
     def analyze_skill_gaps(self, user_profile: Dict, target_roles: List[str] = None) -> List[Dict]:
         """Analyze skill gaps for user profile"""
+        if target_roles:
+            return self._analyze_skill_gaps(user_profile, target_roles)
+        
+        # Skill levels depend only on experience and education, so skill order
+        # and case don't matter; interest order does, as it orders the roles
+        key = (
+            tuple(sorted({skill.lower() for skill in user_profile.get('skills', [])})),
+            tuple(user_profile.get('interests', [])),
+            user_profile.get('experience_level', 'entry'),
+            user_profile.get('education', '')
+        )
+        # Copy so callers can't mutate the cached results
+        return [dict(gap, learning_resources=list(gap['learning_resources'])) for gap in self._cached_gaps(key)]
+    
+    def _analyze_profile_key(self, key: tuple) -> tuple:
+        """Uncached analysis for a canonical profile key from analyze_skill_gaps"""
+        skills, interests, experience_level, education = key
+        user_profile = {
+            'skills': skills,
+            'interests': interests,
+            'experience_level': experience_level,
+            'education': education
+        }
+        return tuple(self._analyze_skill_gaps(user_profile))
+    
+    def _analyze_skill_gaps(self, user_profile: Dict, target_roles: List[str] = None) -> List[Dict]:
+        """Skill gaps for user profile against target roles, or roles from its interests"""
         user_skills = {skill.lower(): self._estimate_user_level(skill, user_profile) 
                       for skill in user_profile.get('skills', [])}
         
@@ -147,42 +266,39 @@ class SkillAnalyzer:
             # Use recommended roles based on user interests
             target_roles = self._get_target_roles_from_interests(user_profile)
         
-        skill_gaps = []
-        analyzed_skills = set()
-        
+        # A skill shared by several roles needs the highest level any of them asks for
+        required_skills = defaultdict(int)
         for role in target_roles:
-            required_skills = self._get_required_skills_for_role(role)
+            for skill_name, required_level in self._get_required_skills_for_role(role).items():
+                required_skills[skill_name] = max(required_skills[skill_name], required_level)
+        
+        gaps = []
+        for skill_name, required_level in required_skills.items():
+            skill_key = _SKILL_KEYS[skill_name]
+            current_level = user_skills.get(skill_key, 0)
             
-            for skill_name, required_level in required_skills.items():
-                if skill_name.lower() in analyzed_skills:
-                    continue
-                
-                current_level = user_skills.get(skill_name.lower(), 0)
-                
-                if current_level < required_level:
-                    gap_info = self._create_skill_gap_info(
-                        skill_name, current_level, required_level, user_profile
-                    )
-                    skill_gaps.append(gap_info)
-                    analyzed_skills.add(skill_name.lower())
+            if current_level < required_level:
+                gap_size = required_level - current_level
+                importance_score = _SKILL_WEIGHTS.get(skill_key, _DEFAULT_WEIGHT) * gap_size
+                gaps.append((importance_score, gap_size, skill_name, skill_key, current_level, required_level))
         
-        # Sort by importance and gap size
-        skill_gaps.sort(key=lambda x: (x['importance_score'], x['gap_size']), reverse=True)
-        return skill_gaps[:10]  # Return top 10 gaps
+        # Sort by importance and gap size, descending; the sort is stable, so
+        # ties keep role order. Only the top 10 get result dicts built
+        gaps.sort(key=itemgetter(0, 1), reverse=True)
+        return [
+            self._create_skill_gap_info(
+                skill_name, current_level, required_level, importance_score,
+                _priority(importance_score), skill_key
+            )
+            for importance_score, _, skill_name, skill_key, current_level, required_level in gaps[:10]
+        ]
     
     def _estimate_user_level(self, skill: str, user_profile: Dict) -> int:
         """Estimate user's current skill level (1-10 scale)"""
         experience_level = user_profile.get('experience_level', 'entry')
         
         # Base level based on experience
-        base_levels = {
-            'entry': 3,
-            'mid': 5,
-            'senior': 7,
-            'executive': 8
-        }
-        
-        base_level = base_levels.get(experience_level, 3)
+        base_level = _BASE_LEVELS.get(experience_level, 3)
         
         # Adjust based on education
         education = user_profile.get('education', '')
@@ -195,69 +311,29 @@ class SkillAnalyzer:
     
     def _get_target_roles_from_interests(self, user_profile: Dict) -> List[str]:
         """Get target roles based on user interests"""
-        interests = [interest.lower() for interest in user_profile.get('interests', [])]
+        # dict.fromkeys dedupes while keeping first-seen order
+        target_roles = dict.fromkeys(
+            role
+            for interest in user_profile.get('interests', [])
+            for role in _roles_for_interest(interest.lower())
+        )
         
-        role_mapping = {
-            'technology': ['Software Engineer', 'Data Scientist'],
-            'data': ['Data Scientist', 'Data Analyst'],
-            'management': ['Project Manager', 'Product Manager'],
-            'design': ['UX Designer', 'Product Designer'],
-            'security': ['Cybersecurity Analyst', 'Security Engineer']
-        }
-        
-        target_roles = []
-        for interest in interests:
-            for key, roles in role_mapping.items():
-                if key in interest:
-                    target_roles.extend(roles)
-        
-        return list(set(target_roles)) if target_roles else ['Software Engineer', 'Data Analyst']
+        return list(target_roles) if target_roles else list(_DEFAULT_TARGET_ROLES)
     
     def _get_required_skills_for_role(self, role: str) -> Dict[str, int]:
         """Get required skills and their levels for a specific role"""
-        role_requirements = {
-            'Data Scientist': {
-                'Python': 8, 'Machine Learning': 8, 'Statistics': 7,
-                'Data Analysis': 8, 'Communication': 6
-            },
-            'Software Engineer': {
-                'Programming': 8, 'JavaScript': 7, 'Python': 6,
-                'Problem Solving': 8, 'Communication': 6
-            },
-            'Project Manager': {
-                'Project Management': 9, 'Communication': 9, 'Leadership': 8,
-                'Agile': 7, 'Risk Management': 6
-            },
-            'Data Analyst': {
-                'Data Analysis': 8, 'SQL': 7, 'Excel': 7,
-                'Statistics': 6, 'Communication': 7
-            },
-            'Cybersecurity Analyst': {
-                'Cybersecurity': 8, 'Network Security': 7, 'Risk Assessment': 7,
-                'Incident Response': 6, 'Compliance': 6
-            }
-        }
-        
-        return role_requirements.get(role, {})
+        return _ROLE_REQUIREMENTS.get(role, _EMPTY)
     
     def _create_skill_gap_info(self, skill_name: str, current_level: int, 
-                              required_level: int, user_profile: Dict) -> Dict:
-        """Create detailed skill gap information"""
-        skill_info = self.skill_database.get(skill_name, {})
+                              required_level: int, importance_score: float, priority: str,
+                              skill_key: str = None) -> Dict:
+        """Create detailed skill gap information for an already scored gap"""
+        skill_key = skill_key or skill_name.lower()
+        skill_info = _SKILL_DB_LOWER.get(skill_key, _EMPTY)
         gap_size = required_level - current_level
         
-        # Calculate importance score
         market_demand = skill_info.get('market_demand', 5)
         difficulty = skill_info.get('difficulty', 5)
-        importance_score = (market_demand * 0.7 + (10 - difficulty) * 0.3) * gap_size
-        
-        # Determine priority level
-        if importance_score >= 7:
-            priority = 'High'
-        elif importance_score >= 4:
-            priority = 'Medium'
-        else:
-            priority = 'Low'
         
         return {
             'skill': skill_name,
@@ -266,7 +342,7 @@ class SkillAnalyzer:
             'gap_size': gap_size,
             'importance': priority,
             'importance_score': importance_score,
-            'learning_resources': self.learning_resources.get(skill_name, []),
+            'learning_resources': list(_RES_LOWER.get(skill_key, ())),
             'estimated_learning_time': skill_info.get('avg_learning_time_weeks', 8),
             'market_demand': market_demand,
             'difficulty': difficulty,
@@ -283,13 +359,14 @@ class SkillAnalyzer:
         estimated_weeks = gap * weeks_per_level
         
         # Create milestones
+        resources = _TOP3_RES.get(skill_name, ())
         milestones = []
         for level in range(current_level + 1, target_level + 1):
             milestone = {
                 'level': level,
                 'description': f'Reach level {level} in {skill_name}',
                 'estimated_weeks': weeks_per_level,
-                'resources': self.learning_resources.get(skill_name, [])[:3]
+                'resources': resources
             }
             milestones.append(milestone)
         